@@ -1,21 +1,104 @@
 import streamlit as st
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.etree
+import lxml.html
 import pandas as pd
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 from urllib.parse import urljoin
-from collections import defaultdict, OrderedDict
-import plotly.express as px 
+import urllib.robotparser
 import re
-from datetime import datetime, date, timedelta
-from dateutil.relativedelta import relativedelta
+from datetime import date
 import io
+import gzip
+import hashlib
+import shutil
+from pathlib import Path
 
 # --- Configuration and Core Scraping Functions ---
 
 DOMAIN = "https://www.lavozdegalicia.es"
 SEARCH_ENDPOINT = "https://www.lavozdegalicia.es/buscador/q/"
+ROBOTS_URL = "https://www.lavozdegalicia.es/robots.txt"
 DEFAULT_PAGE_SIZE = 10
+DATE_FROM = pd.Timestamp(2025, 1, 1)  # Only articles published from this date on are reported
+PAGE_LOOKAHEAD = 2  # pages of a variant in flight at once
+REQUESTS_PER_SECOND = 4
+SCRAPE_CACHE_TTL = 3600  # seconds
+PROGRESS_INTERVAL = 0.2  # seconds between progress bar redraws
+PAGE_CACHE_DIR = Path.home() / '.cache' / 'lavoz'
+PAGE_CACHE_TTL = 3600  # seconds a variant's cached pages are reused, counted from its page 1
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Referer': SEARCH_ENDPOINT 
+}
+
+# The search POST is read-only, so it is safe to retry like a GET
+RETRY_POLICY = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=None)
+
+@st.cache_resource
+def get_session():
+    """
+    One keep-alive session per server process, shared by every rerun, so
+    DNS and TCP+TLS are negotiated once per pooled connection.
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=RETRY_POLICY))
+    return session
+
+@st.cache_resource(ttl=86400)
+def _load_robots():
+    """
+    The site's robots.txt, parsed once a day per server process. It is
+    fetched with the app's own session so the rules match what the scraper
+    sends. A 404 or other 4xx means no rules. A 401/403, a 5xx or a network
+    error raises instead, so cache_resource keeps nothing and the next
+    search asks again.
+    """
+    response = get_session().get(ROBOTS_URL, timeout=10)
+    if response.status_code in (401, 403) or response.status_code >= 500:
+        response.raise_for_status()
+
+    robots = urllib.robotparser.RobotFileParser(ROBOTS_URL)
+    if response.status_code >= 400:
+        robots.allow_all = True
+    else:
+        robots.parse(response.text.splitlines())
+    return robots
+
+def get_robots():
+    """
+    The cached robots.txt rules, or a fallback for this search only: a
+    401/403 disallows it, and an unreachable robots.txt allows it at the
+    default rate.
+    """
+    try:
+        return _load_robots()
+    except requests.exceptions.RequestException as e:
+        robots = urllib.robotparser.RobotFileParser(ROBOTS_URL)
+        if isinstance(e, requests.exceptions.HTTPError) and e.response.status_code in (401, 403):
+            robots.disallow_all = True
+        else:
+            robots.allow_all = True
+        return robots
+
+# --- ENCODING FIX: decode every page as UTF-8 regardless of headers ---
+HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+# Compiled once; each returns its result straight from libxml2
+# First headline link of every <article>, found in one pass over the page
+_ARTICLE_LINKS = lxml.etree.XPath("//article/descendant::a[@href][ancestor::h1][1]")
+_ENTRY_DATE = "ancestor::article[1]/descendant::time[contains(concat(' ', normalize-space(@class), ' '), ' entry-date ')][1]"
+_ENTRY_DATE_ATTR = lxml.etree.XPath(f"string({_ENTRY_DATE}/@datetime)")
+_ENTRY_DATE_TEXT = lxml.etree.XPath(f"normalize-space({_ENTRY_DATE})")
+_TITLE_TEXT = lxml.etree.XPath("normalize-space(.)")
+# Article ID at the end of every article URL, e.g. .../0003_202503O14C2991.htm
+_ARTICLE_ID_RE = re.compile(r'/(\d{4}_\w+)\.htm')
 
 # --- Helper: Name Variations ---
 def get_search_variations(name_input):
@@ -40,70 +123,78 @@ def get_search_variations(name_input):
     return variations
 
 # --- Helper: Fiscal Month Calculator ---
-def calculate_fiscal_month(date_obj):
+def calculate_fiscal_month(dates):
     """
     Determines the 'Fiscal Month' (YYYY-MM) based on the 15th-14th rule.
+    Works on a whole datetime Series at once; NaT stays missing.
     """
-    try:
-        if pd.isna(date_obj):
-            return None
-            
-        if date_obj.day > 14:
-            # Belongs to next month
-            adjusted_date = date_obj + relativedelta(months=1)
-        else:
-            # Belongs to current month
-            adjusted_date = date_obj
-            
-        return adjusted_date.strftime('%Y-%m')
-    except:
-        return None
+    # Integer month codes: days after the 14th add one to the calendar month
+    fiscal_periods = dates.dt.to_period('M') + (dates.dt.day > 14).astype('int64')
+    return fiscal_periods.dt.strftime('%Y-%m')
 
 # --- Date Parsing Helper ---
-@st.cache_data
-def parse_date_and_normalize(date_str):
-    """Parses Spanish date strings."""
-    date_str = date_str.strip()
-    spanish_months = {
-        'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6,
-        'julio': 7, 'agosto': 8, 'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12
-    }
-    match = re.search(r'(\d+)\s+de\s+(\w+)\s+de\s+(\d{4})', date_str, re.IGNORECASE)
-    if match:
-        try:
-            day = int(match.group(1))
-            month_name = match.group(2).lower()
-            year = int(match.group(3))
-            month_num = spanish_months.get(month_name)
-            if month_num:
-                return f"{year}-{month_num:02d}-{day:02d}"
-        except Exception:
-            pass
-            
+SPANISH_MONTHS = {
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6,
+    'julio': 7, 'agosto': 8, 'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12
+}
+_SPANISH_DATE_RE = re.compile(r'(\d+)\s+de\s+(\w+)\s+de\s+(\d{4})', re.IGNORECASE)
+# Whole words only, so names like 'Mayer' no longer read as 'ayer'
+_REL_DATE_RE = re.compile(r'\b(?:hoy|ayer|ahora|horas?|minutos?)\b', re.IGNORECASE)
+# Date part of an ISO timestamp, kept in the article's local time (no UTC shift)
+_ISO_DATE_RE = re.compile(r'^\s*(\d{4}-\d{2}-\d{2})')
+
+def normalize_dates(date_raw):
+    """
+    Normalizes a Series of raw date strings to YYYY-MM-DD in one pass.
+    ISO timestamps (the <time datetime> attribute) are sliced as published,
+    Spanish 'D de mes de YYYY' text is assembled with pd.to_datetime, and
+    relative dates ('hace 2 horas', 'ayer') become today. Anything else is
+    kept as is for the day-first pandas parse downstream.
+    """
+    normalized = date_raw.str.extract(_ISO_DATE_RE, expand=False)
+    missing = normalized.isna()
+    if not missing.any():
+        return normalized
+
+    rest = date_raw[missing]
+    parts = rest.str.extract(_SPANISH_DATE_RE)
+    spanish = pd.to_datetime(pd.DataFrame({
+        'year': pd.to_numeric(parts[2]),
+        'month': parts[1].str.lower().map(SPANISH_MONTHS),
+        'day': pd.to_numeric(parts[0]),
+    }), errors='coerce')
+    rest_normalized = spanish.dt.strftime('%Y-%m-%d')
+
     # Fallback: If today/yesterday logic
-    if any(keyword in date_str.lower() for keyword in ['hoy', 'ayer', 'hora', 'minuto']):
-        return datetime.now().strftime('%Y-%m-%d')
-            
-    # If strict ISO or other format, return as is for pandas to handle
-    return date_str
+    relative = rest.str.contains(_REL_DATE_RE)
+    rest_normalized = rest_normalized.mask(rest_normalized.isna() & relative, date.today().isoformat())
+
+    normalized[missing] = rest_normalized.fillna(rest)
+    return normalized
 
 # --- Data Summarization and Plotting ---
 
-@st.cache_data
 def summarize_by_group(df):
     if df.empty or 'MONTH_GROUP' not in df.columns:
         return pd.DataFrame({'Month': [], 'Count': []})
             
-    monthly_counts = df['MONTH_GROUP'].value_counts().sort_index()
-    summary_df = pd.DataFrame({'Month': monthly_counts.index, 'Count': monthly_counts.values})
-    return summary_df
+    # observed=True: months filtered out of a categorical column must not come back as zeros
+    monthly_counts = df.groupby('MONTH_GROUP', sort=True, observed=True).size()
+    return monthly_counts.rename_axis('Month').reset_index(name='Count')
 
 @st.cache_data
+def to_csv_bytes(df):
+    """Serializes the results for download; reruns with the same rows reuse the bytes."""
+    return df.to_csv(index=False).encode('utf-8')
+
 def create_monthly_plot_plotly(summary_df, search_term):
     """Creates a Plotly bar chart with PINK and PURPLE theme."""
     if summary_df.empty:
         return None
     
+    # Imported here so page loads without results never pay for plotly
+    import plotly.express as px
+    
     average_count = summary_df['Count'].mean()
         
     fig = px.bar(
@@ -150,14 +241,102 @@ def create_monthly_plot_plotly(summary_df, search_term):
     
     return fig
 
+# --- Page Cache (raw HTML checkpoints on disk) ---
+
+def _page_cache_path(term, page_num, page_size):
+    # Day bucket in the key: a whole variant rolls over at midnight, and a
+    # cached 'hace 2 horas' is never read as today's date the next day
+    digest = hashlib.sha1(f"{term}|{page_size}|{date.today().isoformat()}".encode('utf-8')).hexdigest()
+    return PAGE_CACHE_DIR / f"{digest}_{page_num}.html.gz"
+
+def _read_page_cache(path):
+    """Returns the cached page body, or None if missing or unreadable."""
+    try:
+        return gzip.decompress(path.read_bytes())
+    except (OSError, EOFError):
+        return None
+
+def _write_page_cache(path, body):
+    # A failed write only costs a refetch next time, never the search itself
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(gzip.compress(body))
+        tmp_path.replace(path)
+    except OSError:
+        pass
+
+def _expire_variant_pages(term, page_size, max_page):
+    """
+    Drops the cached pages of a variant that no longer line up with its
+    page 1. Pages are only reused as one run starting at page 1, fetched
+    within PAGE_CACHE_TTL: a refetched page 1 can push articles down, and
+    a cached page after it would then start too late and skip some.
+    """
+    paths = [_page_cache_path(term, page_num, page_size) for page_num in range(1, max_page + 1)]
+    try:
+        fresh = time.time() - paths[0].stat().st_mtime <= PAGE_CACHE_TTL
+    except OSError:
+        fresh = False
+
+    # Everything from the first page that has to be fetched again goes
+    for path in paths:
+        if fresh and path.exists():
+            continue
+        fresh = False
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+def _prune_page_cache():
+    """Deletes page files older than PAGE_CACHE_TTL, which no search reuses any more."""
+    cutoff = time.time() - PAGE_CACHE_TTL
+    try:
+        paths = list(PAGE_CACHE_DIR.iterdir())
+    except OSError:
+        return
+    for path in paths:
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+def clear_page_cache():
+    shutil.rmtree(PAGE_CACHE_DIR, ignore_errors=True)
+
 # --- Main Scraping Logic ---
 
-def scrape_lavoz_recursive(search_variations, max_page=5, page_size=DEFAULT_PAGE_SIZE, progress_bar=None, status_text=None):
+class _RateLimiter:
+    """Thread-safe token bucket shared by the page-fetch workers."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+def _scrape(search_variations, max_page, page_size, on_progress=None):
     """
-    Scrapes articles with UTF-8 enforcement.
+    Scrapes articles with UTF-8 enforcement, without touching any widgets.
+    Pages of each variant are fetched concurrently and parsed in order.
+    Returns the articles DataFrame and the request errors hit on the way.
     """
-    all_articles_data = []
-    unique_links = set() 
+    # One list per column; pandas builds each column straight from its list
+    titles, dates_raw, urls, found_via = [], [], [], []
+    unique_links = set()
     
     base_form_data = {
         'pageSize': str(page_size),
@@ -169,77 +348,169 @@ def scrape_lavoz_recursive(search_variations, max_page=5, page_size=DEFAULT_PAGE
     
     total_steps = len(search_variations) * max_page
     current_step = 0
-
-    for term in search_variations:
-        base_form_data['text'] = term 
-        
-        if status_text:
-            status_text.markdown(f"🌸 Buscando variante: **'{term}'**...")
-
-        for page_num in range(1, max_page + 1):
-            current_step += 1
-            if progress_bar:
-                progress_bar.progress(current_step / total_steps)
-
-            form_data = base_form_data.copy()
-            form_data['pageNumber'] = str(page_num) 
+    errors = []
+    session = get_session()
+    # Results come newest first, so a page reaching back past this ends the variant
+    date_cutoff = DATE_FROM.strftime('%Y-%m-%d')
+
+    robots = get_robots()
+    user_agent = HEADERS['User-Agent']
+    if not robots.can_fetch(user_agent, SEARCH_ENDPOINT):
+        errors.append("robots.txt de lavozdegalicia.es no permite consultar el buscador.")
+        return pd.DataFrame(), errors
+
+    # An advertised Crawl-delay replaces the default rate: one request per delay, no burst
+    crawl_delay = robots.crawl_delay(user_agent)
+    if crawl_delay:
+        rate_limiter = _RateLimiter(1 / max(float(crawl_delay), 0.1), 1)
+    else:
+        rate_limiter = _RateLimiter(REQUESTS_PER_SECOND, PAGE_LOOKAHEAD)
+
+    # Variants already stopped; a page of theirs still waiting on the rate limiter is dropped
+    finished_terms = set()
+
+    def fetch_page(term, page_num):
+        # Built once per task; workers run concurrently, so the base is never mutated
+        form_data = {**base_form_data, 'text': term, 'pageNumber': str(page_num)}
+
+        # Pages fetched by an earlier search are resumed from disk
+        cache_path = _page_cache_path(term, page_num, page_size)
+        body = _read_page_cache(cache_path)
+        if body is None:
+            rate_limiter.acquire()
+            if term in finished_terms:
+                return None
+            response = session.post(SEARCH_ENDPOINT, data=form_data, timeout=10)
+            response.raise_for_status()
+            body = response.content
+            _write_page_cache(cache_path, body)
+
+        return lxml.html.parse(io.BytesIO(body), parser=HTML_PARSER).getroot()
+
+    _prune_page_cache()
+
+    with ThreadPoolExecutor(max_workers=PAGE_LOOKAHEAD) as executor:
+        for term in search_variations:
+            if on_progress:
+                on_progress(term, current_step / total_steps)
+
+            # Before any of its pages is read, so no cached page follows a refetched one
+            _expire_variant_pages(term, page_size, max_page)
+
+            # A bounded window: the next page downloads while this one is parsed,
+            # and a stop leaves at most PAGE_LOOKAHEAD - 1 requests already sent
+            in_flight = deque(
+                executor.submit(fetch_page, term, page_num)
+                for page_num in range(1, min(PAGE_LOOKAHEAD, max_page) + 1)
+            )
+            queued = len(in_flight)
 
             try:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                    'Referer': SEARCH_ENDPOINT 
-                }
-                response = requests.post(SEARCH_ENDPOINT, headers=headers, data=form_data, timeout=10)
-                
-                # --- ENCODING FIX ---
-                response.encoding = 'utf-8' 
-                
-                response.raise_for_status()
-
-                soup = BeautifulSoup(response.text, 'html.parser')
-                article_containers = soup.select('article') 
-                
-                if not article_containers:
-                    break
-                    
-                for container in article_containers:
-                    link_tag = container.select_one('h1 a[href]')
-                    if not (link_tag and link_tag.get('href')):
-                        continue 
-                    
-                    article_url = urljoin(DOMAIN, link_tag.get('href'))
-                    
-                    if article_url in unique_links:
-                        continue
+                while in_flight:
+                    root = in_flight.popleft().result()
+                    current_step += 1
+                    if on_progress:
+                        on_progress(term, current_step / total_steps)
 
-                    title = link_tag.get_text(strip=True)
-                    
-                    # Date logic: Prefer datetime attribute, fallback to text
-                    date_tag = container.select_one('time.entry-date')
-                    date_raw = date_tag.get_text(strip=True) if date_tag else 'Date Not Found'
+                    article_links = _ARTICLE_LINKS(root) if root is not None else []
                     
-                    if date_tag and date_tag.has_attr('datetime'):
-                         if len(date_tag['datetime']) > 5:
-                             date_raw = date_tag['datetime']
-
-                    normalized_date = parse_date_and_normalize(date_raw)
-
-                    unique_links.add(article_url)
-                    all_articles_data.append({
-                        'TITLE': title,
-                        'DATE_NORMALIZED': normalized_date,
-                        'DATE_RAW': date_raw,
-                        'URL': article_url,
-                        'FOUND_VIA': term 
-                    })
-            
-                time.sleep(0.5) 
+                    if not article_links:
+                        break
+                        
+                    for link_tag in article_links:
+                        href = link_tag.get('href')
+                        if not href:
+                            continue 
+                        
+                        # Site-absolute paths are all this site emits; urljoin covers the rest
+                        if href.startswith('/') and not href.startswith('//'):
+                            article_url = DOMAIN + href
+                        else:
+                            article_url = urljoin(DOMAIN, href)
+
+                        # Dedupe on the short article ID; the same article can
+                        # be linked under different section/slug paths
+                        id_match = _ARTICLE_ID_RE.search(href)
+                        article_key = id_match.group(1) if id_match else article_url
+                        if article_key in unique_links:
+                            continue
+
+                        title = _TITLE_TEXT(link_tag)
+                        
+                        # Date logic: Prefer datetime attribute, fallback to text
+                        date_raw = _ENTRY_DATE_ATTR(link_tag)
+                        if len(date_raw) <= 5:
+                            date_raw = _ENTRY_DATE_TEXT(link_tag) or 'Date Not Found'
+
+                        unique_links.add(article_key)
+                        titles.append(title)
+                        dates_raw.append(date_raw)
+                        urls.append(article_url)
+                        found_via.append(term)
+
+                    # Only the ISO attribute is compared; text dates just keep paging
+                    oldest = _ISO_DATE_RE.match(_ENTRY_DATE_ATTR(article_links[-1]))
+                    if oldest and oldest.group(1) < date_cutoff:
+                        break
+
+                    # The variant goes on: slide the window one page further
+                    if queued < max_page:
+                        queued += 1
+                        in_flight.append(executor.submit(fetch_page, term, queued))
 
             except requests.exceptions.RequestException as e:
-                st.error(f"Error: {e}")
-                break
+                errors.append(str(e))
+            finally:
+                # Pages after an empty page, the date cutoff or an error are not needed
+                finished_terms.add(term)
+                for future in in_flight:
+                    future.cancel()
         
-    return pd.DataFrame(all_articles_data)
+    df = pd.DataFrame({'TITLE': titles, 'DATE_RAW': dates_raw, 'URL': urls, 'FOUND_VIA': found_via})
+    if not df.empty:
+        df.insert(1, 'DATE_NORMALIZED', normalize_dates(df['DATE_RAW']))
+        # A handful of variants across all rows: small integer codes instead of objects
+        df['FOUND_VIA'] = df['FOUND_VIA'].astype('category')
+    return df, errors
+
+def scrape_lavoz_recursive(search_variations, max_page=5, page_size=DEFAULT_PAGE_SIZE, progress_bar=None, status_text=None):
+    """
+    Drives the progress widgets around the scrape. An identical search made
+    in this session within SCRAPE_CACHE_TTL is answered without any request.
+    """
+    cache = st.session_state.setdefault('scrape_cache', {})
+    cache_key = (tuple(search_variations), max_page, page_size)
+    cached = cache.get(cache_key)
+    if cached and time.monotonic() - cached[0] < SCRAPE_CACHE_TTL:
+        return cached[1].copy()
+
+    current_term = [None]
+    # Each widget update is a websocket round-trip; redraw at most every PROGRESS_INTERVAL
+    last_update = [0.0]
+    last_fraction = [0.0]
+
+    def on_progress(term, fraction):
+        if status_text and term != current_term[0]:
+            status_text.markdown(f"🌸 Buscando variante: **'{term}'**...")
+            current_term[0] = term
+        last_fraction[0] = fraction
+        now = time.monotonic()
+        if progress_bar and now - last_update[0] > PROGRESS_INTERVAL:
+            progress_bar.progress(fraction)
+            last_update[0] = now
+
+    df, errors = _scrape(search_variations, max_page, page_size, on_progress=on_progress)
+    if progress_bar:
+        progress_bar.progress(last_fraction[0])
+
+    # Only complete scrapes are cached; after an error the next search retries
+    if errors:
+        for error in errors:
+            st.error(f"Error: {error}")
+    else:
+        cache[cache_key] = (time.monotonic(), df.copy())
+
+    return df
 
 
 # --- Streamlit Application Layout ---
@@ -262,15 +533,21 @@ st.markdown("**Todo rosa, xd.** El mes fiscal corresponde con 15-14 para el cál
 st.sidebar.header("🔍 Configuración")
 search_input = st.sidebar.text_input("TÉRMINO A BUSCAR", value="CLAUDIA ZAPATER")
 max_pages = st.sidebar.slider("Páginas máx. por variante", 1, 10, 5)
+force_refresh = st.sidebar.checkbox("🔄 Forzar actualización (ignorar caché)", value=False)
 
 # --- Search Logic ---
 if 'df_results' not in st.session_state:
     st.session_state['df_results'] = pd.DataFrame()
+    st.session_state['available_months'] = []
 
 if st.sidebar.button("🌺 BUSCAR ARTÍCULOS", type="primary"):
     
     variations = get_search_variations(search_input)
     
+    if force_refresh:
+        clear_page_cache()
+        st.session_state.pop('scrape_cache', None)
+    
     st.markdown(f"<h3 class='sub-header'>⏳ Buscando variantes: {', '.join(variations)}...</h3>", unsafe_allow_html=True)
     
     progress_bar = st.progress(0)
@@ -285,18 +562,31 @@ if st.sidebar.button("🌺 BUSCAR ARTÍCULOS", type="primary"):
     
     # --- FILTER: NUCLEAR OPTION FOR 2025 ---
     if not df_raw.empty:
-        # 1. Convert to Datetime (Handle ISO and European formats)
-        df_raw['DATE_OBJ'] = pd.to_datetime(df_raw['DATE_NORMALIZED'], dayfirst=True, errors='coerce')
+        # 1. Convert to Datetime (normalize_dates output is YYYY-MM-DD)
+        date_obj = pd.to_datetime(df_raw['DATE_NORMALIZED'], format='%Y-%m-%d', errors='coerce')
+        # Whatever it left as is still gets the European-first parse (e.g. 14/03/2025)
+        leftover = date_obj.isna()
+        if leftover.any():
+            date_obj[leftover] = pd.to_datetime(
+                df_raw.loc[leftover, 'DATE_NORMALIZED'], format='mixed', dayfirst=True, errors='coerce'
+            )
+        df_raw['DATE_OBJ'] = date_obj
         
         # 2. Drop Invalid Dates
         df_raw.dropna(subset=['DATE_OBJ'], inplace=True)
         
-        # 3. Strict Integer Year Filter
-        df_2025 = df_raw[df_raw['DATE_OBJ'].dt.year >= 2025].copy()
+        # 3. Year Filter against a precomputed Timestamp
+        df_2025 = df_raw[df_raw['DATE_OBJ'] >= DATE_FROM].copy()
+        
+        # 4. Fiscal Month, computed once per search rather than on every rerun
+        # Categorical, so the month filter's isin compares integer codes
+        df_2025['MONTH_GROUP'] = calculate_fiscal_month(df_2025['DATE_OBJ']).astype('category')
         
         st.session_state['df_results'] = df_2025
+        st.session_state['available_months'] = list(df_2025['MONTH_GROUP'].cat.categories)
     else:
         st.session_state['df_results'] = pd.DataFrame()
+        st.session_state['available_months'] = []
     
     progress_bar.empty()
     
@@ -312,18 +602,16 @@ df_results = st.session_state['df_results']
 
 if not df_results.empty:
     
-    # Calculate Fiscal Month
-    df_results['MONTH_GROUP'] = df_results['DATE_OBJ'].apply(calculate_fiscal_month)
-    
     # --- FILTERS SIDEBAR ---
     st.sidebar.markdown("---")
     st.sidebar.markdown("[**📅 Filtros de Meses (2025)**]")
     
-    # Group Month Filter setup
-    available_months = sorted(df_results['MONTH_GROUP'].dropna().unique())
+    # Group Month Filter setup (derived once per search, not on every rerun)
+    available_months = st.session_state['available_months']
     
     # Checkbox for Select All/Deselect All
     # Use a unique key for the checkbox to ensure it resets when data changes
+    # Kept outside the form so toggling it resets the month list right away
     select_all_key = f"select_all_{len(available_months)}"
     select_all = st.sidebar.checkbox("Seleccionar todos los meses", value=True, key=select_all_key)
     
@@ -332,16 +620,20 @@ if not df_results.empty:
     else:
         default_selection = []
         
-    # Multiselect for individual months
-    selected_months = st.sidebar.multiselect(
-        "Meses seleccionados:",
-        options=available_months,
-        default=default_selection
-    )
+    # Month picks live in a form: edits only rerun the page once, on "Aplicar"
+    with st.sidebar.form("month_filters"):
+        # Multiselect for individual months
+        selected_months = st.multiselect(
+            "Meses seleccionados:",
+            options=available_months,
+            default=default_selection
+        )
+        
+        st.form_submit_button("Aplicar filtros")
     
     # Apply Filters
     mask = (df_results['MONTH_GROUP'].isin(selected_months))
-    df_filtered = df_results[mask].copy()
+    df_filtered = df_results[mask]
 
     if df_filtered.empty:
         st.warning("No hay resultados con los filtros seleccionados.")
@@ -380,7 +672,12 @@ if not df_results.empty:
             
         with col2:
             st.markdown("[**Visualización**]")
-            fig_plotly = create_monthly_plot_plotly(summary_df, search_input)
+            # Rebuild the figure only when the bars or the title actually change
+            plot_key = (tuple(summary_df['Month']), tuple(summary_df['Count']), search_input)
+            if st.session_state.get('plot_key') != plot_key:
+                st.session_state['plot_fig'] = create_monthly_plot_plotly(summary_df, search_input)
+                st.session_state['plot_key'] = plot_key
+            fig_plotly = st.session_state['plot_fig']
             if fig_plotly:
                 st.plotly_chart(fig_plotly, use_container_width=True)
 
@@ -388,11 +685,9 @@ if not df_results.empty:
 
         # --- Section 3: Download ---
         st.markdown("---")
-        csv_buffer = io.StringIO()
-        df_filtered.to_csv(csv_buffer, index=False)
         st.download_button(
             label="💜 Descargar CSV (Resultados Filtrados)",
-            data=csv_buffer.getvalue(),
+            data=to_csv_bytes(df_filtered),
             file_name=f'reporte_2025_{search_input.replace(" ", "_")}.csv',
             mime='text/csv',
             type="primary"